@@ -5,77 +5,98 @@ Improved data collection - get more historical data
 import yfinance as yf
 import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+from src.data_loader import _epoch_ns, _extract_window_returns
+
 print("Improved Data Collection - Multiple Weeks")
 print("="*60)
 
 ticker = yf.Ticker("SPY")
 
-# Strategy: Download multiple 7-day chunks
+# Time windows as integer seconds-of-day (vectorized comparisons below)
+MARKET_OPEN = 9*3600 + 30*60   # 09:30:00
+MARKET_CLOSE = 16*3600         # 16:00:00
+OPEN_WINDOW = 9*3600 + 35*60   # 09:35:00
+CLOSE_START = 15*3600 + 55*60  # 15:55:00
+
+# Strategy: biggest request first. A single period="1mo" call covers the
+# whole range in one round trip; only if Yahoo truncates the 1-minute
+# history do we shard into concurrent 7-day slices (Yahoo caps 1-minute
+# history at ~8 days per ranged request).
 all_open_returns = []
 all_close_returns = []
 
-print("Downloading data in weekly chunks...")
-
-for week in range(4):  # Last 4 weeks
-    try:
-        # Download 7 days at a time (Yahoo limit for 1-min data)
-        end_date = datetime.now() - timedelta(days=week*7)
-        start_date = end_date - timedelta(days=7)
-        
-        print(f"\nWeek {week+1}: {start_date.date()} to {end_date.date()}")
-        
-        data = ticker.history(start=start_date, end=end_date, interval="1m")
-        
-        if len(data) == 0:
-            print(f"  No data for this week, skipping...")
-            continue
-            
-        # Process data
-        if hasattr(data.index, 'tz_localize'):
-            data.index = data.index.tz_localize(None)
-        
-        data['returns'] = np.log(data['Close'] / data['Close'].shift(1))
-        data['time'] = data.index.time
-        
-        # Filter market hours
-        market_open = pd.Timestamp('09:30:00').time()
-        market_close = pd.Timestamp('16:00:00').time()
-        
-        data = data[(data['time'] >= market_open) & (data['time'] <= market_close)]
-        
-        # Extract returns
-        open_window = pd.Timestamp('09:35:00').time()
-        open_ret = data[(data['time'] >= market_open) & 
-                       (data['time'] <= open_window)]['returns'].dropna()
-        
-        close_start = pd.Timestamp('15:55:00').time()
-        close_ret = data[(data['time'] >= close_start) & 
-                        (data['time'] <= market_close)]['returns'].dropna()
-        
-        all_open_returns.extend(open_ret.values)
-        all_close_returns.extend(close_ret.values)
-        
-        print(f" Got {len(open_ret)} open returns, {len(close_ret)} close returns")
-        
-    except Exception as e:
-        print(f" Error: {e}")
-        continue
+print("Downloading data (single 1-month request)...")
+
+chunks = []
+try:
+    data = ticker.history(period="1mo", interval="1m")
+    if len(data) > 0 and data.index.normalize().nunique() >= 5:
+        print(f" Got {len(data)} records in one request")
+        chunks.append(data)
+    else:
+        print("  Truncated response, falling back to 7-day slices...")
+except Exception as e:
+    print(f" Error: {e}")
+
+if not chunks:
+    now = datetime.now()
+    ranges = [(now - timedelta(days=(week+1)*7), now - timedelta(days=week*7))
+              for week in range(4)]
+
+    def fetch_slice(date_range):
+        start_date, end_date = date_range
+        try:
+            return ticker.history(start=start_date, end=end_date, interval="1m")
+        except Exception as e:
+            print(f" Error: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+        results = executor.map(fetch_slice, ranges)
+    chunks = [data for data in results if data is not None and len(data) > 0]
+
+for data in chunks:
+    if hasattr(data.index, 'tz_localize'):
+        data.index = data.index.tz_localize(None)
+
+    # Fused log-return + window-extraction kernel (numba-jitted when
+    # numba is installed, vectorized numpy otherwise)
+    open_ret, close_ret = _extract_window_returns(
+        _epoch_ns(data.index), data['Close'].to_numpy(),
+        MARKET_OPEN, OPEN_WINDOW, CLOSE_START, MARKET_CLOSE)
+
+    all_open_returns.append(open_ret)
+    all_close_returns.append(close_ret)
+
+    print(f" Got {len(open_ret)} open returns, {len(close_ret)} close returns")
 
 # Combine all data
-open_returns = pd.DataFrame({'returns': all_open_returns})
-close_returns = pd.DataFrame({'returns': all_close_returns})
+open_returns = pd.DataFrame({'returns': np.concatenate(all_open_returns) if all_open_returns else []})
+close_returns = pd.DataFrame({'returns': np.concatenate(all_close_returns) if all_close_returns else []})
 
 print(f"\n📈 TOTAL Distribution Statistics:")
 print(f"Open returns  : N={len(open_returns)}, μ={open_returns['returns'].mean():.6f}, σ={open_returns['returns'].std():.6f}")
 print(f"Close returns : N={len(close_returns)}, μ={close_returns['returns'].mean():.6f}, σ={close_returns['returns'].std():.6f}")
 
-# Save
-open_returns.to_csv('data/open_returns.csv', index=False)
-close_returns.to_csv('data/close_returns.csv', index=False)
+# Save (np.savetxt avoids pandas' per-row CSV machinery for one float column).
+# Each file is only written when its window actually collected samples, so a
+# failed or misfiltered run can't clobber a good file with a header-only CSV.
+if len(open_returns) > 0:
+    np.savetxt('data/open_returns.csv', open_returns['returns'].to_numpy(),
+               fmt='%.10g', header='returns', comments='')
+    print(f"\n Saved data/open_returns.csv")
+else:
+    print(f"\n No open returns collected - leaving data/open_returns.csv untouched")
 
-print(f"\n Saved to data/ folder")
+if len(close_returns) > 0:
+    np.savetxt('data/close_returns.csv', close_returns['returns'].to_numpy(),
+               fmt='%.10g', header='returns', comments='')
+    print(f" Saved data/close_returns.csv")
+else:
+    print(f" No close returns collected - leaving data/close_returns.csv untouched")
 print("="*60)
 print("    Improved data collection complete!")
 
@@ -2,13 +2,93 @@
 Data loading and preprocessing for intraday returns
 """
 
-import yfinance as yf
+import hashlib
+import math
+
 import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import yaml
 from pathlib import Path
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _seconds_of_day(time_str):
+    """Convert an 'HH:MM:SS' string to integer seconds since midnight"""
+    t = pd.Timestamp(time_str)
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+
+def _epoch_ns(index):
+    """Epoch-nanosecond integers for a DatetimeIndex of any resolution
+
+    asi8 returns integers in the index's own unit, and non-ns indexes are
+    common (yfinance builds datetime64[s], parquet round-trips give
+    datetime64[us]), so normalize to nanoseconds before the kernel's
+    second-of-day arithmetic. Older pandas without as_unit is ns-only.
+    """
+    if hasattr(index, 'as_unit'):
+        index = index.as_unit('ns')
+    return index.asi8
+
+
+def _extract_window_returns(ts_ns, close, open_lo, open_hi, close_lo, close_hi):
+    """
+    Single-pass kernel: log returns plus open/close window extraction
+
+    Takes the raw epoch-nanosecond index and Close array and returns the
+    filtered open-window and close-window return arrays. JIT-compiled with
+    numba when available; the numpy fallback below does the same thing
+    vectorized.
+    """
+    n = close.size
+    out_open = np.empty(n)
+    out_close = np.empty(n)
+    n_open = 0
+    n_close = 0
+    for i in range(1, n):
+        sod = (ts_ns[i] // 1_000_000_000) % 86400
+        r = math.log(close[i] / close[i - 1])
+        if r != r:  # NaN, mirrors the old dropna
+            continue
+        if open_lo <= sod <= open_hi:
+            out_open[n_open] = r
+            n_open += 1
+        elif close_lo <= sod <= close_hi:
+            out_close[n_close] = r
+            n_close += 1
+    return out_open[:n_open].copy(), out_close[:n_close].copy()
+
+
+def _extract_window_returns_numpy(ts_ns, close, open_lo, open_hi, close_lo, close_hi):
+    """Vectorized fallback for _extract_window_returns without numba"""
+    sod = (ts_ns // 1_000_000_000) % 86400
+    logret = np.empty_like(close)
+    logret[:1] = np.nan  # slice assignment: no-op on empty input
+    np.subtract(np.log(close[1:]), np.log(close[:-1]), out=logret[1:])
+    valid = np.isnan(logret)
+    np.logical_not(valid, out=valid)
+    # Build each window mask with in-place &= so every filter costs two
+    # boolean arrays rather than five
+    open_mask = sod >= open_lo
+    open_mask &= sod <= open_hi
+    open_mask &= valid
+    close_mask = sod >= close_lo
+    close_mask &= sod <= close_hi
+    close_mask &= valid
+    return logret[open_mask], logret[close_mask]
+
+
+if njit is not None:
+    _extract_window_returns = njit(cache=True)(_extract_window_returns)
+else:
+    _extract_window_returns = _extract_window_returns_numpy
+
 
 class DataLoader:
     """Load and preprocess SPY intraday data"""
@@ -19,8 +99,17 @@ class DataLoader:
             self.config = yaml.safe_load(f)
         
         self.ticker = self.config['data']['ticker']
+        # Optional basket of symbols; defaults to just the primary ticker
+        self.tickers = self.config['data'].get('tickers', [self.ticker])
         self.weeks_back = self.config['data']['weeks_back']
         self.interval = self.config['data']['interval']
+
+        # Resolve time-window bounds once instead of re-parsing the config
+        # strings on every process_returns call
+        self._market_open = _seconds_of_day(self.config['data']['market_open'])
+        self._market_close = _seconds_of_day(self.config['data']['market_close'])
+        self._open_window = _seconds_of_day(self.config['data']['open_window'])
+        self._close_start = _seconds_of_day(self.config['data']['close_start'])
         
         # Create directories
         Path(self.config['paths']['raw_data']).mkdir(parents=True, exist_ok=True)
@@ -28,39 +117,90 @@ class DataLoader:
     
     def fetch_data(self):
         """Fetch intraday data from Yahoo Finance"""
-        print(f"Fetching {self.ticker} data for {self.weeks_back} weeks...")
-        
-        ticker_obj = yf.Ticker(self.ticker)
-        all_data = []
-        
-        for week in range(self.weeks_back):
+        # Imported here so load_processed_data-only sessions never pay for
+        # the yfinance/requests/urllib3 import graph
+        import yfinance as yf
+
+        print(f"Fetching {', '.join(self.tickers)} data for {self.weeks_back} weeks...")
+
+        # All symbols go into one batched yf.download call per range, so a
+        # basket costs the same number of HTTP round trips as one ticker
+        symbols = " ".join(self.tickers)
+
+        # Yahoo caps 1-minute data at ~7 days per request, so we still need
+        # weekly chunks - but the requests are independent, so issue them
+        # concurrently instead of paying one network round trip per week
+        now = datetime.now()
+        ranges = [(now - timedelta(days=(week+1)*7), now - timedelta(days=week*7))
+                  for week in range(self.weeks_back)]
+
+        # Each weekly chunk is cached on disk keyed by (symbols, dates,
+        # interval); repeated runs on the same day skip Yahoo entirely.
+        # Dates are day-granular, so the cache naturally expires daily.
+        cache_dir = Path(self.config['paths']['raw_data']) / 'cache'
+        cache_dir.mkdir(parents=True, exist_ok=True)
+
+        def fetch_week(date_range):
+            """Download one weekly chunk to its parquet file, return the path"""
+            start_date, end_date = date_range
+            key = hashlib.sha1(
+                f"{symbols}|{start_date.date()}|{end_date.date()}|{self.interval}"
+                .encode()).hexdigest()
+            cache_file = cache_dir / f'{key}.parquet'
+            if cache_file.exists():
+                print(f"  {start_date.date()} to {end_date.date()}: cache hit")
+                return cache_file
             try:
-                end_date = datetime.now() - timedelta(days=week*7)
-                start_date = end_date - timedelta(days=7)
-                
-                print(f"  Week {week+1}: {start_date.date()} to {end_date.date()}")
-                
-                data = ticker_obj.history(start=start_date, end=end_date, interval=self.interval)
-                
-                if len(data) > 0:
-                    all_data.append(data)
-                    print(f"    {len(data)} records")
-                
+                data = yf.download(symbols, start=start_date, end=end_date,
+                                   interval=self.interval, group_by='ticker',
+                                   threads=True, auto_adjust=True, progress=False)
+                print(f"  {start_date.date()} to {end_date.date()}: {len(data)} records")
+                if len(data) == 0:
+                    return None
+                # Parquet needs string column names, so flatten the symbol
+                # level for multi-ticker frames (restored after reading)
+                if isinstance(data.columns, pd.MultiIndex):
+                    data.columns = ['|'.join(map(str, col)) for col in data.columns]
+                data.to_parquet(cache_file, compression='zstd')
+                return cache_file
             except Exception as e:
                 print(f"      Error: {e}")
-                continue
-        
-        if not all_data:
+                return None
+
+        with ThreadPoolExecutor(max_workers=self.weeks_back) as executor:
+            results = list(executor.map(fetch_week, ranges))
+
+        chunk_files = [f for f in results if f is not None]
+
+        if not chunk_files:
             raise ValueError("No data collected!")
-        
-        # Combine all weeks
-        combined_data = pd.concat(all_data)
-        
-        # Save raw data
-        raw_path = Path(self.config['paths']['raw_data']) / 'spy_intraday_full.csv'
-        combined_data.to_csv(raw_path)
-        print(f"Saved raw data: {raw_path}")
-        
+
+        # Combine all weeks by scanning the parquet chunks with the pyarrow
+        # dataset API - peak memory stays at one materialized copy instead
+        # of the weekly frames plus their concat
+        import pyarrow.dataset as pa_dataset
+        combined_data = (pa_dataset.dataset([str(f) for f in chunk_files], format='parquet')
+                         .to_table().to_pandas(self_destruct=True))
+        if any('|' in col for col in combined_data.columns):
+            combined_data.columns = pd.MultiIndex.from_tuples(
+                tuple(col.split('|', 1)) for col in combined_data.columns)
+
+        # Save raw data per symbol. Recent yfinance returns MultiIndex
+        # columns even for a single ticker (multi_level_index defaults to
+        # True), so gate on the column structure rather than the ticker count
+        raw_dir = Path(self.config['paths']['raw_data'])
+        if isinstance(combined_data.columns, pd.MultiIndex):
+            for ticker in self.tickers:
+                ticker_data = combined_data.xs(ticker, axis=1, level=0)
+                raw_path = raw_dir / f'{ticker.lower()}_intraday_full.csv'
+                ticker_data.to_csv(raw_path)
+                print(f"Saved raw data: {raw_path}")
+            combined_data = combined_data.xs(self.ticker, axis=1, level=0)
+        else:
+            raw_path = raw_dir / f'{self.ticker.lower()}_intraday_full.csv'
+            combined_data.to_csv(raw_path)
+            print(f"Saved raw data: {raw_path}")
+
         return combined_data
     
     def process_returns(self, data):
@@ -71,29 +211,28 @@ class DataLoader:
         if hasattr(data.index, 'tz_localize'):
             data.index = data.index.tz_localize(None)
         
-        # Compute log returns
-        data['returns'] = np.log(data['Close'] / data['Close'].shift(1))
-        data['time'] = data.index.time
-        
-        # Filter market hours
-        market_open = pd.Timestamp(self.config['data']['market_open']).time()
-        market_close = pd.Timestamp(self.config['data']['market_close']).time()
-        data = data[(data['time'] >= market_open) & (data['time'] <= market_close)]
-        
-        # Extract open returns
-        open_window = pd.Timestamp(self.config['data']['open_window']).time()
-        open_returns = data[(data['time'] >= market_open) & 
-                           (data['time'] <= open_window)]['returns'].dropna()
-        
-        # Extract close returns
-        close_start = pd.Timestamp(self.config['data']['close_start']).time()
-        close_returns = data[(data['time'] >= close_start) & 
-                            (data['time'] <= market_close)]['returns'].dropna()
+        # Log returns + window extraction in one fused kernel over the raw
+        # epoch-nanosecond index and Close array (no per-row Python time
+        # objects, no intermediate pandas masks)
+        open_arr, close_arr = _extract_window_returns(
+            _epoch_ns(data.index), data['Close'].to_numpy(),
+            self._market_open, self._open_window,
+            self._close_start, self._market_close)
+        open_returns = pd.Series(open_arr, name='returns')
+        close_returns = pd.Series(close_arr, name='returns')
         
-        # Save processed data
+        # Save processed data - binary .npy is the format load_processed_data
+        # reads back (no text-to-float parsing); the CSVs are kept only as a
+        # human-readable convenience
         processed_path = Path(self.config['paths']['processed_data'])
-        open_returns.to_csv(processed_path / 'open_returns.csv', index=False, header=['returns'])
-        close_returns.to_csv(processed_path / 'close_returns.csv', index=False, header=['returns'])
+        np.save(processed_path / 'open_returns.npy', open_returns.to_numpy())
+        np.save(processed_path / 'close_returns.npy', close_returns.to_numpy())
+        # savetxt skips pandas' per-row CSV quoting machinery for these
+        # single float columns
+        np.savetxt(processed_path / 'open_returns.csv', open_returns.to_numpy(),
+                   fmt='%.10g', header='returns', comments='')
+        np.savetxt(processed_path / 'close_returns.csv', close_returns.to_numpy(),
+                   fmt='%.10g', header='returns', comments='')
         
         print(f"Open returns: {len(open_returns)} samples")
         print(f"Close returns: {len(close_returns)} samples")
@@ -103,10 +242,18 @@ class DataLoader:
     def load_processed_data(self):
         """Load previously processed data"""
         processed_path = Path(self.config['paths']['processed_data'])
-        
-        open_returns = pd.read_csv(processed_path / 'open_returns.csv')['returns']
-        close_returns = pd.read_csv(processed_path / 'close_returns.csv')['returns']
-        
+
+        # Prefer the memory-mapped binary cache; fall back to the CSVs for
+        # data processed before the .npy files existed
+        open_npy = processed_path / 'open_returns.npy'
+        close_npy = processed_path / 'close_returns.npy'
+        if open_npy.exists() and close_npy.exists():
+            open_returns = pd.Series(np.load(open_npy, mmap_mode='r'), name='returns')
+            close_returns = pd.Series(np.load(close_npy, mmap_mode='r'), name='returns')
+        else:
+            open_returns = pd.read_csv(processed_path / 'open_returns.csv')['returns']
+            close_returns = pd.read_csv(processed_path / 'close_returns.csv')['returns']
+
         return open_returns, close_returns
 
 
@@ -2,54 +2,106 @@
 Visualization module for Schrödinger Bridge analysis
 """
 
+import matplotlib
+matplotlib.use('Agg')  # non-interactive: we only ever render to PNG
 import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
 import numpy as np
-from scipy import stats
 import yaml
 from pathlib import Path
 
+_style_applied = False
+
+
+def _apply_style():
+    """Apply the plot style once per process, on first Visualizer use
+
+    style.use walks matplotlib's stylelib directory and set_palette
+    regenerates the palette; seaborn is imported here rather than at
+    module level so `import src` stays cheap for code that never plots.
+    """
+    global _style_applied
+    if _style_applied:
+        return
+    import seaborn as sns
+    plt.style.use('seaborn-v0_8-whitegrid')
+    sns.set_palette("husl")
+    plt.rcParams['figure.figsize'] = (12, 6)
+    plt.rcParams['font.size'] = 11
+    _style_applied = True
+
 
 class Visualizer:
     """Create professional visualizations for bridge analysis"""
-    
+
     def __init__(self, config_path='config.yaml'):
         """Initialize with configuration"""
         with open(config_path, 'r') as f:
             self.config = yaml.safe_load(f)
-        
-        # Set style
-        plt.style.use('seaborn-v0_8-whitegrid')
-        sns.set_palette("husl")
-        plt.rcParams['figure.figsize'] = (12, 6)
-        plt.rcParams['font.size'] = 11
-        
+
+        _apply_style()
+
         # Ensure output directory exists
         self.figures_path = Path(self.config['paths']['results_figures'])
         self.figures_path.mkdir(parents=True, exist_ok=True)
     
+    @staticmethod
+    def _compute_edges(open_arr, close_arr, n_bins=25):
+        """Shared bin edges spanning both return arrays
+
+        One min/max pass instead of letting each hist call derive its own
+        edges - and both histograms land on the same bin grid, so the
+        overlaid densities are directly comparable.
+        """
+        lo = min(open_arr.min(), close_arr.min())
+        hi = max(open_arr.max(), close_arr.max())
+        return np.linspace(lo, hi, n_bins + 1)
+
+    def _draw_histograms(self, ax, open_returns, close_returns,
+                         open_label='Open', close_label='Close'):
+        """Draw the overlaid open/close histograms onto an existing axis"""
+        # float32 is plenty for binning ~1e-4 returns at raster resolution
+        open_arr = open_returns.to_numpy(dtype=np.float32)
+        close_arr = close_returns.to_numpy(dtype=np.float32)
+        edges = self._compute_edges(open_arr, close_arr)
+        ax.hist(open_arr, bins=edges, density=True,
+                alpha=0.6, color='blue', label=open_label, edgecolor='black')
+        ax.hist(close_arr, bins=edges, density=True,
+                alpha=0.6, color='orange', label=close_label, edgecolor='black')
+        ax.axvline(0, color='red', linestyle=':', alpha=0.5, linewidth=1.5)
+        ax.set_xlabel('Log Returns')
+        ax.set_ylabel('Density')
+        ax.grid(True, alpha=0.3)
+
+    def _draw_bridge(self, ax, t_grid, mu_t, sigma_t):
+        """Draw the bridge mean path with its ±1σ band onto an existing axis"""
+        ax.plot(t_grid, mu_t, linewidth=3, color='blue', label='Bridge path μ(t)')
+        ax.fill_between(t_grid, mu_t - sigma_t, mu_t + sigma_t,
+                        alpha=0.2, color='blue', label='±1σ confidence band')
+        ax.grid(True, alpha=0.3)
+
+    def _draw_volatility(self, ax, t_grid, sigma_t):
+        """Draw the volatility evolution onto an existing axis"""
+        ax.plot(t_grid, sigma_t, linewidth=3, color='purple',
+                label='Bridge volatility σ(t)')
+        ax.set_xlabel('Normalized Time')
+        ax.set_ylabel('Volatility')
+        ax.grid(True, alpha=0.3)
+
     def plot_distributions(self, open_returns, close_returns):
         """Plot open vs close return distributions"""
         print("\n  Creating distribution plots...")
-        
+
         fig, axes = plt.subplots(1, 3, figsize=(16, 5))
-        
+
         # Subplot 1: Overlaid histograms
-        axes[0].hist(open_returns, bins=25, density=True, alpha=0.6,
-                    color='blue', label='Open (9:30 AM)', edgecolor='black')
-        axes[0].hist(close_returns, bins=25, density=True, alpha=0.6,
-                    color='orange', label='Close (4:00 PM)', edgecolor='black')
+        self._draw_histograms(axes[0], open_returns, close_returns,
+                              open_label='Open (9:30 AM)', close_label='Close (4:00 PM)')
         axes[0].axvline(open_returns.mean(), color='blue', linestyle='--', linewidth=2,
                        label=f'Open μ={open_returns.mean():.5f}')
         axes[0].axvline(close_returns.mean(), color='orange', linestyle='--', linewidth=2,
                        label=f'Close μ={close_returns.mean():.5f}')
-        axes[0].axvline(0, color='red', linestyle=':', alpha=0.5, linewidth=1.5)
-        axes[0].set_xlabel('Log Returns')
-        axes[0].set_ylabel('Density')
         axes[0].set_title('Return Distributions: Open vs Close', fontweight='bold', fontsize=13)
         axes[0].legend(fontsize=9)
-        axes[0].grid(True, alpha=0.3)
         
         # Subplot 2: Box plot comparison
         bp = axes[1].boxplot([open_returns, close_returns],
@@ -62,12 +114,19 @@ class Visualizer:
         axes[1].grid(True, alpha=0.3, axis='y')
         axes[1].axhline(0, color='red', linestyle=':', alpha=0.5, linewidth=1.5)
         
-        # Subplot 3: Cumulative distributions
-        open_sorted = np.sort(open_returns)
-        close_sorted = np.sort(close_returns)
-        axes[2].plot(open_sorted, np.linspace(0, 1, len(open_sorted)),
+        # Subplot 3: Cumulative distributions (sort in place on a single
+        # copy; float32 ECDF y-axis halves what the renderer has to move)
+        open_sorted = open_returns.to_numpy(copy=True)
+        open_sorted.sort()
+        open_ecdf = np.arange(1, open_sorted.size + 1, dtype=np.float32)
+        open_ecdf /= open_sorted.size
+        close_sorted = close_returns.to_numpy(copy=True)
+        close_sorted.sort()
+        close_ecdf = np.arange(1, close_sorted.size + 1, dtype=np.float32)
+        close_ecdf /= close_sorted.size
+        axes[2].plot(open_sorted, open_ecdf,
                     'b-', linewidth=2, label='Open', alpha=0.8)
-        axes[2].plot(close_sorted, np.linspace(0, 1, len(close_sorted)),
+        axes[2].plot(close_sorted, close_ecdf,
                     color='orange', linewidth=2, label='Close', alpha=0.8)
         axes[2].axvline(0, color='red', linestyle=':', alpha=0.5, linewidth=1.5)
         axes[2].set_xlabel('Log Returns')
@@ -78,9 +137,9 @@ class Visualizer:
         
         plt.tight_layout()
         output_path = self.figures_path / 'distributions.png'
-        plt.savefig(output_path, dpi=150, bbox_inches='tight')
+        fig.savefig(output_path, dpi=150, bbox_inches='tight')
         print(f" Saved: {output_path}")
-        plt.close()
+        plt.close(fig)
         
         return output_path
     
@@ -95,18 +154,15 @@ class Visualizer:
         fig, axes = plt.subplots(2, 1, figsize=(12, 8))
         
         # Plot 1: Mean evolution
-        axes[0].plot(t_grid, mu_t, linewidth=3, color='blue', label='Bridge path μ(t)')
+        self._draw_bridge(axes[0], t_grid, mu_t, sigma_t)
         axes[0].axhline(0, color='red', linestyle='--', alpha=0.7, linewidth=1.5,
                        label='Zero (mean reversion target)')
-        axes[0].fill_between(t_grid, mu_t - sigma_t, mu_t + sigma_t,
-                            alpha=0.2, color='blue', label='±1σ confidence band')
         axes[0].scatter([0, 1], [mu_t[0], mu_t[-1]], s=150, color='red',
                        zorder=5, edgecolor='black', linewidth=2, label='Observed endpoints')
         axes[0].set_ylabel('Mean Return', fontsize=12, fontweight='bold')
         axes[0].set_title('Schrödinger Bridge: Mean Evolution (Open → Close)',
                          fontsize=14, fontweight='bold')
         axes[0].legend(fontsize=10, loc='best')
-        axes[0].grid(True, alpha=0.3)
         axes[0].set_xlim([0, 1])
         
         # Add annotations
@@ -122,8 +178,7 @@ class Visualizer:
                         facecolor='lightgreen', alpha=0.3))
         
         # Plot 2: Volatility evolution
-        axes[1].plot(t_grid, sigma_t, linewidth=3, color='purple',
-                    label='Bridge volatility σ(t)')
+        self._draw_volatility(axes[1], t_grid, sigma_t)
         axes[1].scatter([0, 1], [sigma_t[0], sigma_t[-1]], s=150, color='red',
                        zorder=5, edgecolor='black', linewidth=2, label='Observed endpoints')
         axes[1].axhline(sigma_t.mean(), color='green', linestyle='--', alpha=0.5,
@@ -134,14 +189,13 @@ class Visualizer:
         axes[1].set_title('Volatility Evolution During Trading Day',
                          fontsize=14, fontweight='bold')
         axes[1].legend(fontsize=10, loc='best')
-        axes[1].grid(True, alpha=0.3)
         axes[1].set_xlim([0, 1])
-        
+
         plt.tight_layout()
         output_path = self.figures_path / 'bridge_evolution.png'
-        plt.savefig(output_path, dpi=150, bbox_inches='tight')
+        fig.savefig(output_path, dpi=150, bbox_inches='tight')
         print(f"  Saved: {output_path}")
-        plt.close()
+        plt.close(fig)
         
         return output_path
     
@@ -154,16 +208,9 @@ class Visualizer:
         
         # Top row: Distributions
         ax1 = fig.add_subplot(gs[0, :2])
-        ax1.hist(open_returns, bins=25, density=True, alpha=0.6, color='blue',
-                label='Open', edgecolor='black')
-        ax1.hist(close_returns, bins=25, density=True, alpha=0.6, color='orange',
-                label='Close', edgecolor='black')
-        ax1.axvline(0, color='red', linestyle=':', alpha=0.5)
-        ax1.set_xlabel('Log Returns')
-        ax1.set_ylabel('Density')
+        self._draw_histograms(ax1, open_returns, close_returns)
         ax1.set_title('Return Distributions', fontweight='bold')
         ax1.legend()
-        ax1.grid(True, alpha=0.3)
         
         # Top right: Statistics table
         ax2 = fig.add_subplot(gs[0, 2])
@@ -194,23 +241,17 @@ class Visualizer:
         t_grid = bridge_results['t']
         mu_t = bridge_results['mu']
         sigma_t = bridge_results['sigma']
-        ax3.plot(t_grid, mu_t, linewidth=3, color='blue', label='Mean path')
-        ax3.fill_between(t_grid, mu_t - sigma_t, mu_t + sigma_t,
-                        alpha=0.2, color='blue', label='±1σ')
+        self._draw_bridge(ax3, t_grid, mu_t, sigma_t)
         ax3.axhline(0, color='red', linestyle='--', alpha=0.5)
         ax3.set_xlabel('Normalized Time')
         ax3.set_ylabel('Mean Return')
         ax3.set_title('Schrödinger Bridge Evolution', fontweight='bold')
         ax3.legend()
-        ax3.grid(True, alpha=0.3)
-        
+
         # Bottom row: Volatility + Interpretation
         ax4 = fig.add_subplot(gs[2, :2])
-        ax4.plot(t_grid, sigma_t, linewidth=3, color='purple')
-        ax4.set_xlabel('Normalized Time')
-        ax4.set_ylabel('Volatility')
+        self._draw_volatility(ax4, t_grid, sigma_t)
         ax4.set_title('Volatility Evolution', fontweight='bold')
-        ax4.grid(True, alpha=0.3)
         
         ax5 = fig.add_subplot(gs[2, 2])
         ax5.axis('off')
@@ -238,10 +279,12 @@ class Visualizer:
         plt.suptitle('Schrödinger Bridge Analysis: Complete Summary',
                     fontsize=16, fontweight='bold', y=0.995)
         
+        # Screen-resolution is enough for the at-a-glance summary; the
+        # individual figures stay at publication dpi
         output_path = self.figures_path / 'summary.png'
-        plt.savefig(output_path, dpi=150, bbox_inches='tight')
+        fig.savefig(output_path, dpi=100, bbox_inches='tight')
         print(f"  Saved: {output_path}")
-        plt.close()
+        plt.close(fig)
         
         return output_path
 